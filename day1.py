@@ -1,17 +1,105 @@
-# Input path
-input_path = "inputs/input_day1.txt"
-
-# Read and process input in one step
-list1, list2 = [], []
-with open(input_path, "r") as file:
-    data = [line.split() for line in file]
-    list1 = sorted(int(parts[0].strip()) for parts in data)
-    list2 = sorted(int(parts[1].strip()) for parts in data)
-
-# Part 1: Calculate total distance
-total_distance = sum(abs(x - y) for x, y in zip(list1, list2))
-print(total_distance)
-
-# Part 2: Calculate similarity score using built-in count method
-similarity_score = sum(x * list2.count(x) for x in set(list1))
-print(similarity_score)
+import heapq
+from array import array
+from collections import Counter
+
+# Input path
+input_path = "inputs/input_day1.txt"
+
+# Number of bytes of lines parsed per chunk by the streaming loader
+chunk_size = 1 << 24
+
+
+def load_location_arrays(file_path, chunk_bytes=chunk_size):
+    """
+    Stream both columns into sorted, compact int64 arrays.
+
+    Each chunk of lines is parsed straight into array('q') buffers and sorted
+    as a run; the runs are then merged into the final arrays, so only one
+    chunk is ever held as Python ints.
+
+    :param file_path: Path to the input file.
+    :param chunk_bytes: Approximate number of bytes of lines per chunk.
+    :return: A tuple of two sorted array('q') columns.
+    """
+    runs1, runs2 = [], []
+    with open(file_path, "r") as file:
+        while True:
+            lines = file.readlines(chunk_bytes)
+            if not lines:
+                break
+            tokens = "".join(lines).split()
+            runs1.append(array("q", sorted(map(int, tokens[0::2]))))
+            runs2.append(array("q", sorted(map(int, tokens[1::2]))))
+            del lines, tokens
+
+    return merge_runs(runs1), merge_runs(runs2)
+
+
+def merge_runs(runs):
+    """Merge sorted array('q') runs into a single sorted array('q') (a Python-level k-way merge)."""
+    if len(runs) == 1:
+        return runs[0]
+    return array("q", heapq.merge(*runs))
+
+
+def location_stats(list1, list2):
+    """
+    Compute the total distance and the similarity score in a single pass.
+
+    The similarity score is built from a histogram of list2, so each distinct
+    value of list1 is scored with an O(1) lookup instead of a list2.count scan.
+
+    :param list1: Left column of location IDs, sorted ascending.
+    :param list2: Right column of location IDs, sorted ascending.
+    :return: A tuple (total_distance, similarity_score).
+    """
+    counts = Counter(list2)
+    total_distance = 0
+    similarity_score = 0
+    previous = None
+    for x, y in zip(list1, list2):
+        total_distance += abs(x - y)
+        if x != previous:  # Score each distinct value once
+            similarity_score += x * counts.get(x, 0)
+            previous = x
+    return total_distance, similarity_score
+
+
+def location_stats_sorted(list1, list2):
+    """
+    Sort-merge variant of location_stats for pre-sorted data.
+
+    list2 is walked with a second pointer while list1 is walked pairwise, so
+    no histogram is built and both answers come out of the same loop.
+
+    :param list1: Left column of location IDs, sorted ascending.
+    :param list2: Right column of location IDs, sorted ascending.
+    :return: A tuple (total_distance, similarity_score).
+    """
+    total_distance = 0
+    similarity_score = 0
+    previous = None
+    j, m = 0, len(list2)
+    for x, y in zip(list1, list2):
+        total_distance += abs(x - y)
+        if x == previous:
+            continue
+        previous = x
+        while j < m and list2[j] < x:
+            j += 1
+        run = j
+        while run < m and list2[run] == x:
+            run += 1
+        similarity_score += x * (run - j)
+        j = run
+    return total_distance, similarity_score
+
+
+if __name__ == "__main__":
+    # Stream the input into sorted int64 arrays
+    list1, list2 = load_location_arrays(input_path)
+
+    # Part 1 and Part 2: Total distance and similarity score from one pass
+    total_distance, similarity_score = location_stats_sorted(list1, list2)
+    print(total_distance)
+    print(similarity_score)
@@ -1,3 +1,7 @@
+import operator
+from array import array
+
+
 def load_grid(file_path):
     with open(file_path, "r") as file:
         return [list(map(int, list(line.strip()))) for line in file]
@@ -11,67 +15,69 @@ def get_neighbors(r, c, rows, cols):
             yield nr, nc
 
 
-def find_reachable_nines(grid, start_r, start_c):
-    """Part One BFS: Returns count of unique 9-cells reachable from (start_r, start_c)"""
-    rows = len(grid)
+def cells_by_height(grid):
+    """Group the flat cell indices (r * cols + c) of the grid by height."""
     cols = len(grid[0])
-    from collections import deque
+    layers = [[] for _ in range(10)]
+    for r, row in enumerate(grid):
+        for c, height in enumerate(row):
+            layers[height].append(r * cols + c)
+    return layers
 
-    queue = deque([(start_r, start_c)])
-    visited = set([(start_r, start_c)])
-    reachable_nines = set()
 
-    while queue:
-        r, c = queue.popleft()
-        if grid[r][c] == 9:
-            reachable_nines.add((r, c))
-            # continue checking other paths as other 9s may be reachable
-            continue
+def part_one_score(grid):
+    """
+    Sum of trailhead scores, from one sweep over the height layers.
+
+    Sweeping from height 8 down to 0, each cell's set of reachable nines is
+    the union of the sets of its neighbours one step higher. Only the layer
+    above is kept, cells reaching no nine are dropped, and a cell with a
+    single contributing neighbour shares that neighbour's set, so memory
+    follows the reachable nines rather than cells x nines.
+    """
+    rows = len(grid)
+    cols = len(grid[0])
+    layers = cells_by_height(grid)
 
-        current_height = grid[r][c]
-        next_height = current_height + 1
-        for nr, nc in get_neighbors(r, c, rows, cols):
-            if grid[nr][nc] == next_height and (nr, nc) not in visited:
-                visited.add((nr, nc))
-                queue.append((nr, nc))
+    above = {cell: frozenset((cell,)) for cell in layers[9]}
+    for height in range(8, -1, -1):
+        current = {}
+        for cell in layers[height]:
+            r, c = divmod(cell, cols)
+            nines = [above[nr * cols + nc] for nr, nc in get_neighbors(r, c, rows, cols) if nr * cols + nc in above]
+            if nines:
+                current[cell] = nines[0] if len(nines) == 1 else frozenset().union(*nines)
+        above = current
 
-    return len(reachable_nines)
+    return sum(map(len, above.values()))
 
 
-def part_one_score(grid):
-    rows = len(grid)
-    cols = len(grid[0])
-    trailheads = [(r, c) for r in range(rows) for c in range(cols) if grid[r][c] == 0]
-    total_score = 0
-    for r, c in trailheads:
-        score = find_reachable_nines(grid, r, c)
-        total_score += score
-    return total_score
+def shifted_sum(level, width):
+    """Sum each cell's four neighbours in a flat, right-padded grid, one whole-grid shift at a time."""
+    zeros = array("q", bytes(8 * width))
+    left = level[1:] + zeros[:1]
+    right = zeros[:1] + level[:-1]
+    below = level[width:] + zeros
+    above = zeros + level[:-width]
+    return array("q", map(operator.add, map(operator.add, left, right), map(operator.add, below, above)))
 
 
 def part_two_score(grid):
-    """Count total distinct paths starting from each trailhead to any 9"""
-    rows = len(grid)
+    """
+    Count total distinct paths starting from each trailhead to any 9.
+
+    Sweeping from height 9 down to 0, the number of paths from every cell
+    of height h is the sum of the counts of its neighbours of height h + 1,
+    computed for the whole grid at once with shifted array sums.
+    """
     cols = len(grid[0])
-    trailheads = [(r, c) for r in range(rows) for c in range(cols) if grid[r][c] == 0]
-
-    from functools import lru_cache
-
-    @lru_cache(None)
-    def count_paths(r, c):
-        if grid[r][c] == 9:
-            return 1
-        current_height = grid[r][c]
-        total = 0
-        for nr, nc in get_neighbors(r, c, rows, cols):
-            if grid[nr][nc] == current_height + 1:
-                total += count_paths(nr, nc)
-        return total
-
-    total_rating = 0
-    for r, c in trailheads:
-        total_rating += count_paths(r, c)
-    return total_rating
+    width = cols + 1  # A padding column keeps left/right shifts from wrapping rows
+    heights = array("b", [height for row in grid for height in (*row, -1)])
+
+    level = array("q", map((9).__eq__, heights))
+    for height in range(8, -1, -1):
+        level = array("q", map(operator.mul, shifted_sum(level, width), map(height.__eq__, heights)))
+    return sum(level)
 
 
 def main():
@@ -1,11 +1,54 @@
+import operator
+from bisect import bisect_right
 from collections import Counter
 
+# Powers of ten used to count digits without formatting stones as strings
+powers_of_ten = [10**i for i in range(1, 40)]
+
+# Blinks between the count vectors kept while searching for a recurrence
+checkpoint_interval = 32
+
+# Stone -> successor stones, shared across blinks and across runs in the same process
+transition_cache = {}
+cache_stats = {"hits": 0, "misses": 0}
+
 
 def load_stones(file_path):
     """Load the stones from the input file."""
     with open(file_path, "r") as file:
         stones = file.read().strip().split()
-    return Counter(stones)  # Use Counter to keep track of stone counts
+    return Counter(map(int, stones))  # Use Counter to keep track of stone counts
+
+
+def digit_count(stone):
+    """Number of decimal digits of a non-negative integer."""
+    while stone >= powers_of_ten[-1]:
+        powers_of_ten.append(powers_of_ten[-1] * 10)
+    return bisect_right(powers_of_ten, stone) + 1
+
+
+def stone_successors(stone):
+    """Return the stones a single stone turns into after one blink, using the transition cache."""
+    successors = transition_cache.get(stone)
+    if successors is not None:
+        cache_stats["hits"] += 1
+        return successors
+    cache_stats["misses"] += 1
+
+    if stone == 0:
+        # Rule 1: Replace 0 with 1
+        successors = (1,)
+    else:
+        length = digit_count(stone)
+        if length % 2 == 0:
+            # Rule 2: Split even-length stone into two halves
+            successors = divmod(stone, powers_of_ten[length // 2 - 1])
+        else:
+            # Rule 3: Multiply by 2024
+            successors = (stone * 2024,)
+
+    transition_cache[stone] = successors
+    return successors
 
 
 def transform_stones(stone_counts):
@@ -13,38 +56,234 @@ def transform_stones(stone_counts):
     new_counts = Counter()
 
     for stone, count in stone_counts.items():
-        if stone == "0":
-            # Rule 1: Replace "0" with "1"
-            new_counts["1"] += count
-        else:
-            length = len(stone)
-            if length % 2 == 0:
-                # Rule 2: Split even-length stone into two halves
-                half = length // 2
-                left_str = str(int(stone[:half]))
-                right_str = str(int(stone[half:]))
-                new_counts[left_str] += count
-                new_counts[right_str] += count
-            else:
-                # Rule 3: Multiply by 2024
-                val = int(stone)
-                new_val = str(val * 2024)
-                new_counts[new_val] += count
+        for successor in stone_successors(stone):
+            new_counts[successor] += count
 
     return new_counts
 
 
+def count_stones(stone_counts, blinks):
+    """
+    Count the stones after a number of blinks.
+
+    :param stone_counts: Counter of stone values.
+    :param blinks: Number of blinks.
+    :return: A tuple (total_stones, hit_rate) where hit_rate is the transition cache hit rate during these blinks.
+    """
+    hits, misses = cache_stats["hits"], cache_stats["misses"]
+    for _ in range(blinks):
+        stone_counts = transform_stones(stone_counts)
+
+    lookups = cache_stats["hits"] - hits + cache_stats["misses"] - misses
+    hit_rate = (cache_stats["hits"] - hits) / lookups if lookups else 0.0
+    return sum(stone_counts.values()), hit_rate
+
+
+def reachable_stones(stone_counts):
+    """Return the closed set of stone values reachable from the given stones, in discovery order."""
+    index = {stone: i for i, stone in enumerate(stone_counts)}
+    states = list(index)
+    for stone in states:  # states grows while it is walked
+        for successor in stone_successors(stone):
+            if successor not in index:
+                index[successor] = len(states)
+                states.append(successor)
+    return states
+
+
+def build_transition_matrix(states):
+    """
+    Sparse transition matrix over the closed set of stone values.
+
+    Every stone turns into one or two stones, so the matrix is stored as two
+    index rows: first[i] and second[i] are the states stone i turns into,
+    with second[i] pointing at an extra always-zero slot when there is none.
+    """
+    index = {stone: i for i, stone in enumerate(states)}
+    first, second = [], []
+    for stone in states:
+        successors = stone_successors(stone)
+        first.append(index[successors[0]])
+        second.append(index[successors[1]] if len(successors) > 1 else len(states))
+    return first, second
+
+
+def gather(indices):
+    """Return a function picking the given indices out of a list, as a tuple."""
+    if len(indices) < 2:
+        # itemgetter needs at least one index and returns a bare value for exactly one
+        return lambda values: tuple(values[i] for i in indices)
+    return operator.itemgetter(*indices)
+
+
+def berlekamp_massey(sequence, modulus):
+    """
+    Find the shortest linear recurrence of a sequence modulo a prime.
+
+    :return: Connection coefficients c with c[0] == 1 and sum(c[i] * s[n - i]) == 0 (mod modulus).
+    """
+    current, previous = [1], [1]
+    length, shift, last_discrepancy = 0, 1, 1
+    for n, value in enumerate(sequence):
+        window = sequence[n - length : n][::-1] if length else []
+        discrepancy = (value + sum(map(operator.mul, current[1 : length + 1], window))) % modulus
+        if discrepancy == 0:
+            shift += 1
+            continue
+        factor = modulus - discrepancy * pow(last_discrepancy, -1, modulus) % modulus
+        updated = current + [0] * max(0, len(previous) + shift - len(current))
+        updated[shift : shift + len(previous)] = [
+            (u + factor * p) % modulus for u, p in zip(updated[shift : shift + len(previous)], previous)
+        ]
+        if 2 * length <= n:
+            length, previous, last_discrepancy, shift = n + 1 - length, current, discrepancy, 1
+        else:
+            shift += 1
+        current = updated
+    return current[: length + 1]
+
+
+def polynomial_multiply(a, b, modulus):
+    """Multiply two polynomials modulo a prime, packing the coefficients into big integers (Kronecker substitution)."""
+    digits = -(-(2 * modulus.bit_length() + max(len(a), len(b)).bit_length()) // 4)  # Hex digits per coefficient
+
+    def pack(polynomial):
+        return int("".join(format(c, f"0{digits}x") for c in reversed(polynomial)), 16)
+
+    product = format(pack(a) * pack(b), f"0{digits * (len(a) + len(b) - 1)}x")
+    return [int(product[i - digits : i], 16) % modulus for i in range(len(product), 0, -digits)]
+
+
+def recurrence_term(initial_terms, connection, n, modulus):
+    """
+    Return term n of a linear recurrence modulo a prime.
+
+    The sequence is the power series P(x) / C(x) with C the connection
+    polynomial, and each round of Bostan-Mori halves n by multiplying both
+    by C(-x), so the cost is logarithmic in n.
+    """
+    order = len(connection) - 1
+    if order == 0:
+        return 0
+    numerator = polynomial_multiply(initial_terms[:order], connection, modulus)[:order]
+    denominator = connection
+    while n:
+        conjugate = [c if i % 2 == 0 else -c % modulus for i, c in enumerate(denominator)]
+        numerator = polynomial_multiply(numerator, conjugate, modulus)[n & 1 :: 2]
+        denominator = polynomial_multiply(denominator, conjugate, modulus)[::2]
+        n >>= 1
+    return numerator[0]
+
+
+def blink_counts(matrix, counts, modulus=None):
+    """
+    Advance per-state stone counts by one blink.
+
+    counts[i] is the number of stones a single stone i turns into, so the
+    next counts are two gathers over the transition matrix and an add.
+
+    :param matrix: (first, second) gather functions from build_transition_matrix.
+    :param counts: Current counts, with the trailing always-zero slot.
+    :param modulus: Reduce the new counts modulo this value, if given.
+    """
+    first, second = matrix
+    counts = list(map(operator.add, first(counts), second(counts)))
+    if modulus:
+        counts = list(map(modulus.__rmod__, counts))
+    counts.append(0)
+    return counts
+
+
+def total_stones(weights, counts, modulus=None):
+    """Total stones for the initial stone weights, given per-state counts."""
+    stones = sum(map(operator.mul, weights, counts))
+    return stones % modulus if modulus else stones
+
+
+def recurrence_holds(matrix, checkpoints, start, connection, modulus):
+    """
+    Check a recurrence on the full count vectors from blink start onwards.
+
+    The vector at start is rebuilt from the nearest earlier checkpoint. If
+    sum(connection[i] * counts[order - i]) vanishes for these order + 1
+    consecutive vectors, it vanishes for every later blink as well.
+    """
+    counts = checkpoints[start - start % checkpoint_interval]
+    for _ in range(start % checkpoint_interval):
+        counts = blink_counts(matrix, counts)
+    order = len(connection) - 1
+    residual = [0] * len(counts)
+    for i in range(order, -1, -1):
+        counts = list(map(modulus.__rmod__, counts))
+        residual = list(map(operator.add, residual, map(connection[i].__mul__, counts)))
+        counts = blink_counts(matrix, counts)
+    return not any(map(modulus.__rmod__, residual))
+
+
+def count_stones_after(stone_counts, blinks, modulus=None):
+    """
+    Count the stones after a number of blinks using the sparse transition matrix.
+
+    The closed set of reachable stone values and its transition matrix are
+    built once, and each blink is two gathers and an add (see blink_counts).
+
+    With a prime modulus, the counts are only iterated until Berlekamp-Massey
+    finds a recurrence that the full count vectors also satisfy (which then
+    holds for every later blink), and the answer is read off the recurrence
+    in time logarithmic in blinks, so huge blink counts cost about as much as
+    small ones. Without a modulus the exact count is iterated blink by blink,
+    since it has about 0.18 * blinks digits.
+
+    :param stone_counts: Counter of stone values.
+    :param blinks: Number of blinks.
+    :param modulus: Prime modulus for the result, or None for the exact count.
+    :return: The number of stones after the blinks (modulo modulus if given).
+    """
+    states = reachable_stones(stone_counts)
+    if not states:
+        return 0
+    matrix = tuple(map(gather, build_transition_matrix(states)))
+    weights = [stone_counts[stone] for stone in states] + [0]
+
+    counts = [1] * len(states) + [0]
+    totals = [total_stones(weights, counts, modulus)]
+    if modulus is None:
+        for _ in range(blinks):
+            counts = blink_counts(matrix, counts)
+        return total_stones(weights, counts)
+
+    checkpoints = {0: counts}  # Reduced count vectors every checkpoint_interval blinks
+    terms = 32
+    while True:
+        while len(totals) < min(terms, blinks + 1):
+            # Counts at most double per blink, so reducing every checkpoint keeps them small
+            reduce = len(totals) % checkpoint_interval == 0
+            counts = blink_counts(matrix, counts, modulus if reduce else None)
+            if reduce:
+                checkpoints[len(totals)] = counts
+            totals.append(total_stones(weights, counts, modulus))
+        if blinks < len(totals):
+            return totals[blinks]
+
+        connection = berlekamp_massey(totals, modulus)
+        order = len(connection) - 1
+        if len(totals) >= 2 * order + 8:
+            # Check the recurrence on the full count vectors ending at the last term
+            start = len(totals) - 1 - order
+            if recurrence_holds(matrix, checkpoints, start, connection, modulus):
+                return recurrence_term(totals[start:], connection, blinks - start, modulus)
+        # Berlekamp-Massey needs twice the recurrence order in terms
+        terms = max(terms * 3 // 2, 2 * order + 16)
+
+
 def main():
     file_path = "inputs/input_day11.txt"
     stone_counts = load_stones(file_path)
 
-    # Apply transformations 75 times
-    for _ in range(75):
-        stone_counts = transform_stones(stone_counts)
-
-    # Calculate the total number of stones
-    total_stones = sum(stone_counts.values())
+    # Apply transformations 75 times and calculate the total number of stones
+    total_stones, hit_rate = count_stones(stone_counts, 75)
     print(total_stones)
+    print(f"Transition cache hit rate: {hit_rate:.2%}")
 
 
 if __name__ == "__main__":
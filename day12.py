@@ -3,56 +3,89 @@ def load_grid(file_path):
         return [list(line.strip()) for line in file]
 
 
-def get_neighbors(x, y, grid):
-    neighbors = []
+def find(parent, cell):
+    """Find the root of a cell, halving the path on the way."""
+    while parent[cell] != cell:
+        parent[cell] = parent[parent[cell]]
+        cell = parent[cell]
+    return cell
+
+
+def measure_regions(grid):
+    """
+    Label every region with a row-scan union-find and measure it in the same pass.
+
+    The grid is flattened with a one-cell border of a sentinel value, so all
+    neighbour checks are plain index arithmetic. Each cell adds its own area,
+    border edges and corners to its region; when the scan joins a cell to the
+    region on its left or above, the roots and their totals are merged. The
+    number of sides of a region equals its number of corners.
+
+    :return: A list of (area, perimeter, sides) tuples, one per region.
+    """
     rows, cols = len(grid), len(grid[0])
-    for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-        nx, ny = x + dx, y + dy
-        if 0 <= nx < rows and 0 <= ny < cols:
-            neighbors.append((nx, ny))
-    return neighbors
-
-
-def explore_region(x, y, grid, visited):
-    stack = [(x, y)]
-    region_area = 0
-    region_perimeter = 0
-    region_char = grid[x][y]
-
-    while stack:
-        cx, cy = stack.pop()
-        if (cx, cy) in visited:
-            continue
-        visited.add((cx, cy))
-        region_area += 1
-
-        for nx, ny in get_neighbors(cx, cy, grid):
-            if grid[nx][ny] == region_char:
-                if (nx, ny) not in visited:
-                    stack.append((nx, ny))
-            else:
-                region_perimeter += 1
-
-        # Check border edges since the neighbors are not considered if they are outside the grid
-        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            nx, ny = cx + dx, cy + dy
-            if not (0 <= nx < len(grid) and 0 <= ny < len(grid[0])):
-                region_perimeter += 1
-
-    return region_area, region_perimeter
+    width = cols + 2
+    cells = [None] * width + [cell for row in grid for cell in (None, *row, None)] + [None] * width
+
+    parent = list(range(len(cells)))
+    area = [0] * len(cells)
+    perimeter = [0] * len(cells)
+    corners = [0] * len(cells)
+
+    for r in range(1, rows + 1):
+        for p in range(r * width + 1, r * width + cols + 1):
+            plant = cells[p]
+            up = cells[p - width] == plant
+            down = cells[p + width] == plant
+            left = cells[p - 1] == plant
+            right = cells[p + 1] == plant
+
+            area[p] = 1
+            perimeter[p] = 4 - up - down - left - right
+            # A corner is convex when both sides differ, concave when both match but the diagonal differs
+            corners[p] = (
+                (not up and not left or up and left and cells[p - width - 1] != plant)
+                + (not up and not right or up and right and cells[p - width + 1] != plant)
+                + (not down and not left or down and left and cells[p + width - 1] != plant)
+                + (not down and not right or down and right and cells[p + width + 1] != plant)
+            )
+
+            for neighbour, same in ((p - 1, left), (p - width, up)):
+                if not same:
+                    continue
+                a, b = find(parent, p), find(parent, neighbour)
+                if a == b:
+                    continue
+                if area[a] < area[b]:
+                    a, b = b, a
+                parent[b] = a
+                area[a] += area[b]
+                perimeter[a] += perimeter[b]
+                corners[a] += corners[b]
+
+    return [
+        (area[p], perimeter[p], corners[p])
+        for r in range(1, rows + 1)
+        for p in range(r * width + 1, r * width + cols + 1)
+        if parent[p] == p
+    ]
+
+
+def calculate_prices(grid):
+    """
+    Calculate both fencing prices from a single labelling pass.
+
+    :return: A tuple (total_price, bulk_price) where total_price uses area * perimeter
+             and bulk_price uses area * number of sides.
+    """
+    regions = measure_regions(grid)
+    total_price = sum(area * perimeter for area, perimeter, _ in regions)
+    bulk_price = sum(area * sides for area, _, sides in regions)
+    return total_price, bulk_price
 
 
 def calculate_total_price(grid):
-    visited = set()
-    total_price = 0
-
-    for x in range(len(grid)):
-        for y in range(len(grid[0])):
-            if (x, y) not in visited:
-                area, perimeter = explore_region(x, y, grid, visited)
-                price = area * perimeter
-                total_price += price
-
+    total_price, _ = calculate_prices(grid)
     return total_price
 
 
@@ -60,9 +93,10 @@ def main():
     file_path = "inputs/input_day12.txt"
     grid = load_grid(file_path)
 
-    # Calculate the total price of fencing all regions
-    total_price = calculate_total_price(grid)
+    # Calculate the total price of fencing all regions, with and without the bulk discount
+    total_price, bulk_price = calculate_prices(grid)
     print(f"Total price of fencing all regions: {total_price}")
+    print(f"Total price with bulk discount: {bulk_price}")
 
 
 if __name__ == "__main__":
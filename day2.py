@@ -1,3 +1,7 @@
+import itertools
+import operator
+from array import array
+
 # Input path
 input_path = "inputs/input_day2.txt"
 
@@ -19,13 +23,94 @@ def is_safe_level(level):
     return True
 
 
+def is_ordered_pair(a, b, sign):
+    """Check a single step against the direction (1 ascending, -1 descending) and max_difference."""
+    diff = (b - a) * sign
+    return 0 < diff <= max_difference
+
+
+def find_dampener_index(level, sign):
+    """
+    Find the element to remove so the level is safe in the given direction.
+
+    suffix_valid[i] records whether level[i:] is safe, and the forward scan
+    stops at the first broken step so level[:i] is always safe, so each
+    removal candidate is checked in O(1) without building a new list.
+
+    :return: -1 if no removal is needed, the index to remove, or None if no single removal works.
+    """
+    n = len(level)
+    suffix_valid = bytearray(n + 1)
+    suffix_valid[n] = 1
+    for i in range(n - 1, -1, -1):
+        suffix_valid[i] = i == n - 1 or (suffix_valid[i + 1] and is_ordered_pair(level[i], level[i + 1], sign))
+    if suffix_valid[0]:
+        return -1
+
+    for i in range(n):
+        # level[:i] is safe here, so removing i only needs the suffix and the bridging step
+        if suffix_valid[i + 1] and (i == 0 or i == n - 1 or is_ordered_pair(level[i - 1], level[i + 1], sign)):
+            return i
+        if i > 0 and not is_ordered_pair(level[i - 1], level[i], sign):
+            break  # Every later removal keeps this broken prefix
+    return None
+
+
 # Function to check if a level is safe with one element removed
-def is_safe_level_with_dampener(level):
-    for i in range(len(level)):
-        new_level = level[:i] + level[i + 1 :]  # Remove one element
-        if is_safe_level(new_level):
-            return True
-    return False
+def is_safe_level_with_dampener(level, return_index=False):
+    """
+    Check in O(n) whether a level is safe after removing at most one element.
+
+    :param level: List of integers.
+    :param return_index: Also return the index to remove (None when the level is already safe).
+    :return: A bool, or a tuple (bool, index) if return_index is set.
+    """
+    removal = None
+    for sign in (1, -1):
+        index = find_dampener_index(level, sign)
+        if index == -1:
+            return (True, None) if return_index else True
+        if index is not None and removal is None:
+            removal = index
+    safe = removal is not None
+    return (safe, removal) if return_index else safe
+
+
+def pack_levels(levels):
+    """
+    Pack ragged levels into a CSR-style buffer.
+
+    :param levels: List of lists of integers.
+    :return: A tuple (offsets, values) where level i is values[offsets[i]:offsets[i + 1]].
+    """
+    offsets = array("q", itertools.accumulate(map(len, levels), initial=0))
+    values = array("q", itertools.chain.from_iterable(levels))
+    return offsets, values
+
+
+def evaluate_levels_batch(offsets, values, max_difference=max_difference):
+    """
+    Check every packed level at once.
+
+    The differences of the whole value buffer and their ascending/descending
+    validity flags are computed in C via map and O(1) range membership, so
+    the only Python-level loop is one bytes search per level.
+
+    :param offsets: Level boundaries from pack_levels.
+    :param values: Flattened level values from pack_levels.
+    :param max_difference: Largest allowed step between adjacent values.
+    :return: A bytearray with 1 for each safe level and 0 otherwise.
+    """
+    diffs = list(map(operator.sub, values[1:], values[:-1]))
+    ascending = bytes(map(range(1, max_difference + 1).__contains__, diffs))
+    descending = bytes(map(range(-max_difference, 0).__contains__, diffs))
+
+    safe = bytearray(len(offsets) - 1)
+    for i in range(len(safe)):
+        # Level i owns diffs[start:end]; the diff crossing into the next level is skipped
+        start, end = offsets[i], offsets[i + 1] - 1
+        safe[i] = end <= start or ascending.find(0, start, end) == -1 or descending.find(0, start, end) == -1
+    return safe
 
 
 # Read levels into a list for reusability
@@ -35,7 +120,7 @@ with open(input_path) as f:
     ]  # Preprocess lines into lists of integers
 
 # Calculate safe levels
-safe_levels_count = sum(is_safe_level(level) for level in levels)
+safe_levels_count = sum(evaluate_levels_batch(*pack_levels(levels)))
 safe_levels_count_with_dampener = sum(
     is_safe_level_with_dampener(level) for level in levels
 )
@@ -1,31 +1,140 @@
+import concurrent.futures
+import mmap
+import os
 import re
 
 # Input path
 input_path = "inputs/input_day3.txt"
 
+# Regex to match 'mul(num1,num2)' capturing both numbers, plus the do()/don't() toggles
+pattern = re.compile(rb"mul\((\d{1,3}),(\d{1,3})\)|do\(\)|don't\(\)")
+
+# Longest token the pattern can match: "mul(999,999)"
+max_token_length = 12
+
+# Number of bytes read per chunk
+chunk_size = 1 << 20
+
+# Number of bytes summarised per task in parallel mode
+parallel_chunk_size = 1 << 24
+
+
+def scan_chunk(buffer, compute, final=False):
+    """
+    Scan one buffer of memory for 'mul' operations and toggles.
+
+    :param buffer: Bytes to scan.
+    :param compute: Whether 'mul' operations are enabled at the start of the buffer.
+    :param final: True if no more data follows, so nothing needs to be carried over.
+    :return: A tuple (sum, compute, carry) where carry is the tail that may hold a partial token.
+    """
+    total_sum = 0
+    safe_end = len(buffer) if final else max(len(buffer) - (max_token_length - 1), 0)
+    carry_start = safe_end
+
+    for match in pattern.finditer(buffer):
+        if match.start() >= safe_end:
+            break  # Rescanned with the next chunk, may belong to a longer token
+        token = match.group()
+        if token == b"do()":
+            compute = True
+        elif token == b"don't()":
+            compute = False
+        elif compute:
+            total_sum += int(match.group(1)) * int(match.group(2))
+        carry_start = max(carry_start, match.end())
+
+    return total_sum, compute, buffer[carry_start:]
+
 
 # Function to calculate the total sum from 'mul' operations
-def calculate_mul_sum(file_path):
-    # Define regex to match 'mul(num1,num2)' and capture numbers
-    pattern = r"(mul\((\d{1,3}),(\d{1,3})\)|do\(\)|don\'t\(\))"
+def calculate_mul_sum(file_path, chunk_bytes=chunk_size):
+    """
+    Calculate the total of the enabled 'mul' operations in a memory dump.
+
+    The file is read in fixed-size binary chunks; the do()/don't() state and
+    any partial token at the end of a chunk are carried into the next one, so
+    dumps without newlines are handled in constant memory.
+
+    :param file_path: Path to the memory dump.
+    :param chunk_bytes: Number of bytes read per chunk.
+    :return: The total sum of enabled 'mul' operations.
+    """
     total_sum = 0
     compute = True
+    carry = b""
+
+    with open(file_path, "rb") as file:
+        while chunk := file.read(chunk_bytes):
+            chunk_sum, compute, carry = scan_chunk(carry + chunk, compute)
+            total_sum += chunk_sum
+
+    chunk_sum, compute, _ = scan_chunk(carry, compute, final=True)
+    return total_sum + chunk_sum
 
-    # Read and process the file line by line for memory efficiency
-    with open(file_path, "r") as file:
-        for line in file:
-            # Find all matches in the current line
-            for match in re.finditer(pattern, line):
-                if match.group(1) == "do()":
-                    compute = True
-                elif match.group(1) == "don't()":
-                    compute = False
-                elif compute:
-                    numbers = match.group()[4:-1].split(",")
-                    total_sum += int(numbers[0]) * int(numbers[1])
+
+def summarize_range(file_path, start, end):
+    """
+    Summarise the tokens starting in [start, end) of a memory dump.
+
+    Tokens cannot overlap, so a token straddling the range end is found by
+    reading a few bytes past it, and one starting before the range is left
+    to the previous range.
+
+    :return: A tuple (sum if entered enabled, sum if entered disabled, final state or None if no toggle).
+    """
+    leading_sum = 0  # 'mul' operations before the first toggle
+    trailing_sum = 0  # 'mul' operations after the first toggle, while enabled
+    state = None
+
+    with open(file_path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as memory:
+        stop = min(end + max_token_length - 1, len(memory))
+        for match in pattern.finditer(memory, start, stop):
+            if match.start() >= end:
+                break
+            token = match.group()
+            if token == b"do()":
+                state = True
+            elif token == b"don't()":
+                state = False
+            elif state is None:
+                leading_sum += int(match.group(1)) * int(match.group(2))
+            elif state:
+                trailing_sum += int(match.group(1)) * int(match.group(2))
+
+    return leading_sum + trailing_sum, trailing_sum, state
+
+
+def calculate_mul_sum_parallel(file_path, workers=None, chunk_bytes=parallel_chunk_size):
+    """
+    Calculate the same total as calculate_mul_sum on a process pool.
+
+    Each range is summarised independently of the do()/don't() state it is
+    entered with, and the summaries are folded in order.
+
+    :param file_path: Path to the memory dump.
+    :param workers: Number of worker processes (defaults to the CPU count).
+    :param chunk_bytes: Number of bytes summarised per task.
+    :return: The total sum of enabled 'mul' operations.
+    """
+    size = os.path.getsize(file_path)
+    if size == 0:
+        return 0
+
+    starts = range(0, size, chunk_bytes)
+    ends = [min(start + chunk_bytes, size) for start in starts]
+
+    total_sum = 0
+    compute = True
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        for enabled_sum, disabled_sum, state in executor.map(summarize_range, [file_path] * len(ends), starts, ends):
+            total_sum += enabled_sum if compute else disabled_sum
+            if state is not None:
+                compute = state
 
     return total_sum
 
 
-# Calculate and print the result
-print(calculate_mul_sum(input_path))
+if __name__ == "__main__":
+    # Calculate and print the result
+    print(calculate_mul_sum(input_path))
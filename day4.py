@@ -1,72 +1,154 @@
 # Input path
-import itertools
-
 input_path = "inputs/input_day4.txt"
 
 
-def is_valid_position(x, y, rows, cols):
-    """Check if a position is within the grid boundaries."""
-    return 0 <= x < rows and 0 <= y < cols
+directions = [
+    (-1, 0),
+    (1, 0),  # vertical: up, down
+    (0, -1),
+    (0, 1),  # horizontal: left, right
+    (-1, -1),
+    (-1, 1),
+    (1, -1),
+    (1, 1),  # diagonal: all directions
+]
+
+
+def build_letter_masks(grid, padding):
+    """
+    Turn the grid into one bitset per letter.
+
+    Rows are laid out with `padding` empty columns after them, so bit
+    r * stride + c is set in masks[letter] when grid[r][c] == letter and
+    shifts of up to `padding` columns never wrap into the next row.
+
+    :return: A tuple (masks, stride).
+    """
+    cols = len(grid[0])
+    stride = cols + padding
+    flat = "".join(row.ljust(stride, "\0") for row in grid).encode()
+    masks = {}
+    for letter in set(flat.decode()) - {"\0"}:
+        table = bytes(49 if i == ord(letter) else 48 for i in range(256))  # b"1" / b"0"
+        masks[letter] = int(flat.translate(table)[::-1], 2)
+    return masks, stride
+
+
+def shift_mask(mask, offset):
+    """Align mask so bit p reports cell p + offset."""
+    return mask >> offset if offset >= 0 else mask << -offset
 
 
 # Part 1: Count all occurrences of "XMAS"
 def count_xmas_occurrences(grid, word="XMAS"):
-    directions = [
-        (-1, 0),
-        (1, 0),  # vertical: up, down
-        (0, -1),
-        (0, 1),  # horizontal: left, right
-        (-1, -1),
-        (-1, 1),
-        (1, -1),
-        (1, 1),  # diagonal: all directions
-    ]
     word_length = len(word)
-    rows, cols = len(grid), len(grid[0])
-    count = 0
+    masks, stride = build_letter_masks(grid, word_length - 1)
+    if any(letter not in masks for letter in word):
+        return 0
 
-    for row in range(rows):
-        for col in range(cols):
-            if grid[row][col] == word[0]:  # Found the starting letter
-                for dx, dy in directions:
-                    match = True
-                    for i in range(word_length):
-                        nx, ny = row + dx * i, col + dy * i
-                        if not (
-                            is_valid_position(nx, ny, rows, cols)
-                            and grid[nx][ny] == word[i]
-                        ):
-                            match = False
-                            break
-                    if match:
-                        count += 1
+    count = 0
+    for dx, dy in directions:
+        offset = dx * stride + dy
+        # Bit p survives only if cell p + i * offset holds word[i] for every i
+        match = masks[word[0]]
+        for i in range(1, word_length):
+            match &= shift_mask(masks[word[i]], i * offset)
+        count += match.bit_count()
 
     return count
 
 
 # Part 2: Count all occurrences of "X-MAS" pattern
 def count_x_mas_occurrences(grid):
+    masks, stride = build_letter_masks(grid, 1)
+    if any(letter not in masks for letter in "MAS"):
+        return 0
+    m, s = masks["M"], masks["S"]
+
+    def diagonal_match(offset):
+        # M on one side of the A and S on the other, in either order
+        return (shift_mask(m, -offset) & shift_mask(s, offset)) | (shift_mask(s, -offset) & shift_mask(m, offset))
+
+    return (masks["A"] & diagonal_match(stride + 1) & diagonal_match(stride - 1)).bit_count()
+
+
+def build_automaton(patterns):
+    """
+    Build an Aho-Corasick automaton with a complete transition table.
+
+    :param patterns: List of strings to match.
+    :return: A tuple (goto, fail_order, fail, terminals) where terminals[i]
+             is the node reached by patterns[i].
+    """
+    transitions = [{}]
+    terminals = []
+    for pattern in patterns:
+        node = 0
+        for letter in pattern:
+            if letter not in transitions[node]:
+                transitions.append({})
+                transitions[node][letter] = len(transitions) - 1
+            node = transitions[node][letter]
+        terminals.append(node)
+
+    # Breadth-first pass: inherit the failure node's transitions for missing letters
+    fail = [0] * len(transitions)
+    fail_order = []
+    queue = list(transitions[0].values())
+    goto = [dict(children) for children in transitions]
+    for node in queue:
+        fail_order.append(node)
+        for letter, child in transitions[node].items():
+            fail[child] = goto[fail[node]].get(letter, 0) if node else 0
+            queue.append(child)
+        if node:
+            goto[node] = {**goto[fail[node]], **transitions[node]}
+
+    return goto, fail_order, fail, terminals
+
+
+def grid_lines(grid):
+    """Yield every row, column, diagonal and anti-diagonal of the grid."""
     rows, cols = len(grid), len(grid[0])
-    return sum(
-        bool(
-            grid[row][col] == "A"
-            and (
-                is_valid_position(row - 1, col - 1, rows, cols)
-                and grid[row - 1][col - 1] in ("M", "S")
-                and is_valid_position(row + 1, col + 1, rows, cols)
-                and grid[row + 1][col + 1] in ("M", "S")
-                and grid[row - 1][col - 1] != grid[row + 1][col + 1]
-            )
-            and (
-                is_valid_position(row - 1, col + 1, rows, cols)
-                and grid[row - 1][col + 1] in ("M", "S")
-                and is_valid_position(row + 1, col - 1, rows, cols)
-                and grid[row + 1][col - 1] in ("M", "S")
-                and grid[row - 1][col + 1] != grid[row + 1][col - 1]
-            )
-        )
-        for row, col in itertools.product(range(1, rows - 1), range(1, cols - 1))
-    )
+    yield from grid
+    yield from ("".join(column) for column in zip(*grid))
+    for d in range(-(rows - 1), cols):
+        yield "".join(grid[r][r + d] for r in range(max(0, -d), min(rows, cols - d)))
+        yield "".join(grid[r][cols - 1 - r - d] for r in range(max(0, -d), min(rows, cols - d)))
+
+
+def count_words_occurrences(grid, words):
+    """
+    Count every word in all 8 directions with a single pass over the grid.
+
+    Each word is added to the automaton both forwards and reversed, so the
+    four line orientations cover all eight directions. Hits are tallied per
+    automaton node and pushed down the failure links afterwards, so the scan
+    does not depend on the number of words.
+
+    :param grid: List of equal-length strings.
+    :param words: Iterable of words to count.
+    :return: A dict mapping each word to its number of occurrences.
+    """
+    words = list(dict.fromkeys(words))
+    patterns = words + [word[::-1] for word in words]
+    goto, fail_order, fail, terminals = build_automaton(patterns)
+
+    hits = [0] * len(goto)
+    for line in grid_lines(grid):
+        node = 0
+        for letter in line:
+            node = goto[node].get(letter, 0)
+            hits[node] += 1
+
+    # A node also ends every pattern ending at its failure node
+    for node in reversed(fail_order):
+        hits[fail[node]] += hits[node]
+
+    counts = dict.fromkeys(words, 0)
+    for i, node in enumerate(terminals):
+        counts[words[i % len(words)]] += hits[node]
+    return counts
 
 
 # Load the grid from the file
@@ -1,3 +1,5 @@
+import heapq
+
 # Input path
 input_path = "inputs/input_day5.txt"
 
@@ -19,16 +21,34 @@ def load_rules_and_updates(input_path):
     return rules, updates
 
 
-def is_safe_rule(number, right_number, rule_set):
+def parse_rules(rules):
+    """
+    Parse the rules into an integer adjacency structure.
+
+    :param rules: List of rules in the form "X|Y".
+    :return: A list indexed by page number where bit Y of successors[X] is set for each rule X|Y.
+    """
+    pairs = [tuple(map(int, rule.split("|"))) for rule in rules]
+    successors = [0] * (max((max(pair) for pair in pairs), default=-1) + 1)
+    for before, after in pairs:
+        successors[before] |= 1 << after
+    return successors
+
+
+def is_update_ordered(pages, successors):
     """
-    Check if a rule is safe.
+    Check an update against the rules in O(k).
 
-    :param number: The number to check.
-    :param right_number: The number to check against.
-    :param rule_set: Set of rules for faster lookup.
-    :return: True if the rule is safe, False otherwise.
+    :param pages: List of page numbers.
+    :param successors: Adjacency bitsets from parse_rules.
+    :return: True if no page is preceded by a page that must come after it.
     """
-    return f"{right_number}|{number}" not in rule_set
+    seen = 0
+    for page in pages:
+        if page < len(successors) and successors[page] & seen:
+            return False
+        seen |= 1 << page
+    return True
 
 
 def check_part1(updates, rules):
@@ -39,21 +59,15 @@ def check_part1(updates, rules):
     :param rules: List of rules.
     :return: The total value of valid updates.
     """
-    rule_set = {rule for rule in rules}  # Use a set for O(1) lookups
+    successors = parse_rules(rules)
     total = 0
     wrong_updates = []
 
     for update in updates:
-        update_values = update.split(",")
-        is_update_safe = all(
-            is_safe_rule(number, right_number, rule_set)
-            for i, number in enumerate(update_values)
-            for right_number in update_values[i + 1 :]
-        )
-
-        if is_update_safe:
-            middle_value = int(update_values[len(update_values) // 2])
-            total += middle_value
+        pages = [int(page) for page in update.split(",")]
+
+        if is_update_ordered(pages, successors):
+            total += pages[len(pages) // 2]
         else:
             wrong_updates.append(update)
 
@@ -61,52 +75,103 @@ def check_part1(updates, rules):
 
 
 # Part 2
+def reorder_update(pages, successors):
+    """
+    Reorder an update with a topological sort of the rule subgraph it induces.
+
+    Pages that are free to go next keep their original relative order.
+
+    :param pages: List of page numbers.
+    :param successors: Adjacency bitsets from parse_rules.
+    :return: The reordered list of pages.
+    """
+    position = {page: i for i, page in enumerate(pages)}
+    mask = sum(1 << page for page in position)
+    followers = {page: (successors[page] if page < len(successors) else 0) & mask for page in position}
+
+    indegree = dict.fromkeys(position, 0)
+    for row in followers.values():
+        while row:
+            bit = row & -row
+            indegree[bit.bit_length() - 1] += 1
+            row ^= bit
+
+    ready = [i for i, page in enumerate(pages) if indegree[page] == 0]
+    heapq.heapify(ready)
+    ordered = []
+    while ready:
+        page = pages[heapq.heappop(ready)]
+        ordered.append(page)
+        row = followers[page]
+        while row:
+            bit = row & -row
+            follower = bit.bit_length() - 1
+            indegree[follower] -= 1
+            if indegree[follower] == 0:
+                heapq.heappush(ready, position[follower])
+            row ^= bit
+
+    if len(ordered) != len(position):
+        raise ValueError(f"Rules contain a cycle among pages {pages}")
+    return ordered
+
+
+def select_middle_page(pages, successors):
+    """
+    Find the middle page of the reordered update without sorting it.
+
+    When the rules totally order the update, the follower counts inside the
+    update are exactly 0 .. k - 1, and the middle page is the one with
+    k - 1 - k // 2 followers. Otherwise the update is fully reordered.
+
+    :param pages: List of page numbers.
+    :param successors: Adjacency bitsets from parse_rules.
+    :return: The middle page of the reordered update.
+    """
+    mask = sum(1 << page for page in pages)
+    followers = {(successors[page] & mask).bit_count() if page < len(successors) else 0: page for page in pages}
+    if followers.keys() == set(range(len(pages))):
+        return followers[len(pages) - 1 - len(pages) // 2]
+    return reorder_update(pages, successors)[len(pages) // 2]
+
+
 def adjust_updates(rules, wrong_updates):
     """
-    Adjust the updates based on the rules for part 2, restarting from the same number after adjustments.
+    Adjust the updates based on the rules for part 2.
 
     :param rules: List of rules.
     :param wrong_updates: List of wrong updates.
     :return: A tuple containing the adjusted updates and the total of middle values.
     """
-    rule_set = {rule for rule in rules}  # Convert rules to a set for fast lookups
+    successors = parse_rules(rules)
     adjusted_updates = []
     total = 0
 
     for update in wrong_updates:
-        update_values = update.split(",")
-        i = 0
-        while i < len(update_values) - 1:
-            number = update_values[i]
-            right_number = update_values[i + 1]
-
-            # Check if the current pair violates a rule
-            if not is_safe_rule(number, right_number, rule_set):
-                # Move the current number just after the right number
-                update_values.pop(i)
-                update_values.insert(i + 1, number)
-                # Restart from the same index
-                i = max(0, i - 1)
-            else:
-                # Move to the next pair
-                i += 1
-
-        adjusted_updates.append(",".join(update_values))
-
-    # Sum the middle values of the adjusted updates
-    for update in adjusted_updates:
-        update_values = update.split(",")
-        middle_value = int(update_values[len(update_values) // 2])
-        total += middle_value
+        pages = reorder_update([int(page) for page in update.split(",")], successors)
+        adjusted_updates.append(",".join(map(str, pages)))
+        total += pages[len(pages) // 2]
 
     return adjusted_updates, total
 
 
+def adjusted_middle_total(rules, wrong_updates):
+    """
+    Compute only the part 2 total, selecting each middle page instead of reordering.
+
+    :param rules: List of rules.
+    :param wrong_updates: List of wrong updates.
+    :return: The total of the middle values of the adjusted updates.
+    """
+    successors = parse_rules(rules)
+    return sum(select_middle_page([int(page) for page in update.split(",")], successors) for update in wrong_updates)
+
+
 # Main execution
 if __name__ == "__main__":
     rules, updates = load_rules_and_updates(input_path)
     total, wrong_updates = check_part1(updates, rules)
     print(f"Part 1: The total value of valid updates is {total}.")
 
-    adjusted_updates, total = adjust_updates(rules, wrong_updates)
+    total = adjusted_middle_total(rules, wrong_updates)
     print(f"Part 2: The total value of valid updates after adjustment is {total}.")
@@ -1,27 +1,162 @@
 import concurrent.futures
-import copy
+import os
+from array import array
 
 input_path = "inputs/input_day6.txt"
 
+OBSTACLE = ord("#")
+FREE = ord(".")
+
 
 def load_grid(input_path):
-    with open(input_path, "r") as file:
-        return [list(line.rstrip("\n")) for line in file.readlines()]
+    with open(input_path, "rb") as file:
+        return make_grid([line.rstrip(b"\r\n") for line in file])
+
+
+def make_grid(lines):
+    """
+    Store the map as a flat bytearray indexed by row * cols + col.
+
+    :param lines: List of equal-length rows, as str or bytes.
+    :return: A dictionary with 'cells' (bytearray), 'rows' and 'cols'.
+    """
+    lines = [line.encode() if isinstance(line, str) else bytes(line) for line in lines]
+    return {"cells": bytearray(b"".join(lines)), "rows": len(lines), "cols": len(lines[0])}
 
 
 def find_start_and_direction(grid):
     """Find the guard's starting position and direction."""
-    directions = {"^": (-1, 0), "v": (1, 0), "<": (0, -1), ">": (0, 1)}
-    rows = len(grid)
-    cols = len(grid[0])
-    for r in range(rows):
-        for c in range(cols):
-            if grid[r][c] in directions:
-                start_direction = directions[grid[r][c]]
-                return r, c, start_direction
+    directions = {b"^": (-1, 0), b"v": (1, 0), b"<": (0, -1), b">": (0, 1)}
+    cells = grid["cells"]
+    for symbol, start_direction in directions.items():
+        cell = cells.find(symbol)
+        if cell >= 0:
+            r, c = divmod(cell, grid["cols"])
+            return r, c, start_direction
     return None, None, None
 
 
+directions = [(-1, 0), (0, 1), (1, 0), (0, -1)]  # north, east, south, west
+
+
+def build_patrol_index(grid):
+    """
+    Precompute where the guard stops when walking from any cell in any direction.
+
+    jumps[d][cell] is the flat index of the last free cell before the next
+    obstacle in direction d, or -1 if the guard walks off the map. The
+    guard's starting cell is treated as free.
+
+    :return: A dictionary with 'rows', 'cols', 'jumps', 'start' and 'direction' (None if no guard).
+    """
+    cells, rows, cols = grid["cells"], grid["rows"], grid["cols"]
+    start_row, start_col, start_direction = find_start_and_direction(grid)
+
+    jumps = [array("q", [-1]) * (rows * cols) for _ in directions]
+    for d, (dr, dc) in enumerate(directions):
+        delta = dr * cols + dc
+        # Sweep each line from the edge the guard walks towards
+        if dc == 0:
+            lines = [range(c, rows * cols, cols) if dr < 0 else range((rows - 1) * cols + c, -1, -cols) for c in range(cols)]
+        else:
+            lines = [range(r * cols, (r + 1) * cols) if dc < 0 else range((r + 1) * cols - 1, r * cols - 1, -1) for r in range(rows)]
+        table = jumps[d]
+        for line in lines:
+            stop = -1
+            for cell in line:
+                if cells[cell] == OBSTACLE:
+                    stop = cell - delta
+                else:
+                    table[cell] = stop
+
+    return {
+        "rows": rows,
+        "cols": cols,
+        "jumps": jumps,
+        "start": None if start_row is None else start_row * cols + start_col,
+        "direction": None if start_row is None else directions.index(start_direction),
+    }
+
+
+def edge_cell(index, cell, d):
+    """Return the last cell on the map when walking from cell in direction d."""
+    cols = index["cols"]
+    dr, dc = directions[d]
+    r, c = divmod(cell, cols)
+    distance = [r, cols - 1 - c, index["rows"] - 1 - r, c][d]
+    return cell + distance * (dr * cols + dc)
+
+
+def next_stop(index, cell, d, obstruction=None):
+    """
+    Find where the guard stops walking from cell in direction d.
+
+    A single extra obstruction is overlaid on the jump table: it only matters
+    if it lies on the same row or column between the cell and the stop.
+
+    :return: The flat index of the stop cell, or -1 if the guard leaves the map.
+    """
+    stop = index["jumps"][d][cell]
+    if obstruction is None:
+        return stop
+
+    cols = index["cols"]
+    dr, dc = directions[d]
+    r, c = divmod(cell, cols)
+    obstruction_row, obstruction_col = divmod(obstruction, cols)
+    if (dc == 0 and obstruction_col != c) or (dr == 0 and obstruction_row != r):
+        return stop
+
+    distance = (obstruction_row - r) * dr + (obstruction_col - c) * dc
+    reach_row, reach_col = divmod(stop if stop >= 0 else edge_cell(index, cell, d), cols)
+    reach = (reach_row - r) * dr + (reach_col - c) * dc
+    if 0 < distance <= reach:
+        return obstruction - (dr * cols + dc)
+    return stop
+
+
+def mark_segment(flags, start, end, delta):
+    """Set the byte of every cell from start to end (inclusive), stepping by delta."""
+    low, high = min(start, end), max(start, end)
+    step = abs(delta)
+    flags[low : high + 1 : step] = b"\x01" * ((high - low) // step + 1)
+
+
+def simulate_patrol(index, obstruction=None, visited_positions=None, start=None):
+    """
+    Simulate the guard jumping from obstacle to obstacle.
+
+    Only the states where the guard turns are recorded, as one direction bit
+    per cell: reaching the same turn state twice means the guard is stuck in
+    a loop.
+
+    :param index: Patrol index from build_patrol_index.
+    :param obstruction: Flat index of an extra obstruction, if any.
+    :param visited_positions: Optional bytearray, one byte per cell, set for every cell the guard walks over.
+    :param start: Optional (cell, direction) to resume from instead of the guard's start.
+    :return: True if the guard is stuck, False if it leaves the map.
+    """
+    cols = index["cols"]
+    cell, d = start if start is not None else (index["start"], index["direction"])
+    turn_states = bytearray(index["rows"] * cols)
+
+    while True:
+        stop = next_stop(index, cell, d, obstruction)
+
+        if visited_positions is not None:
+            dr, dc = directions[d]
+            end = stop if stop >= 0 else edge_cell(index, cell, d)
+            mark_segment(visited_positions, cell, end, dr * cols + dc)
+
+        if stop < 0:
+            return False
+
+        if turn_states[stop] & (1 << d):
+            return True
+        turn_states[stop] |= 1 << d
+        cell, d = stop, (d + 1) % 4
+
+
 def simulate_guard(grid):
     """
     Simulate the guard's movement and return:
@@ -29,132 +164,95 @@ def simulate_guard(grid):
       'stuck': bool (True if guard loops/stuck, False otherwise)
       'visited_count': number of distinct positions visited
     """
-    rows = len(grid)
-    cols = len(grid[0])
-
-    start_row, start_col, start_direction = find_start_and_direction(grid)
-    if start_row is None:
+    index = build_patrol_index(grid)
+    if index["start"] is None:
         # No start found
         return {"stuck": False, "visited_count": 0}
 
-    # Make starting cell walkable
-    grid[start_row][start_col] = "."
+    visited_positions = bytearray(len(grid["cells"]))
+    stuck = simulate_patrol(index, visited_positions=visited_positions)
+    return {"stuck": stuck, "visited_count": visited_positions.count(1)}
 
-    directions = [(-1, 0), (0, 1), (1, 0), (0, -1)]
-    if start_direction in directions:
-        dir_index = directions.index(start_direction)
-    else:
-        dir_index = 0  # Default to north if not found
 
-    visited_positions = set()  # for visited cells
-    visited_positions.add((start_row, start_col))
+def count_positions_visited(grid):
+    """Part One: How many distinct positions will the guard visit before leaving?"""
+    sim_result = simulate_guard(grid)
+    return sim_result["visited_count"]
 
-    # Track states: (row, col, dir_index)
-    # If we hit the same state twice, we're in a loop.
-    visited_states = set()
-    visited_states.add((start_row, start_col, dir_index))
 
-    current_row, current_col = start_row, start_col
+def find_route_candidates(index):
+    """
+    Find the obstruction candidates on the guard's original route.
+
+    An obstruction anywhere else is never touched, so it cannot change the
+    route. For each candidate the guard's state just before it first enters
+    the cell is kept, since the route up to there is unchanged.
 
-    def is_forward_status(r, c, dr, dc):
-        nr, nc = r + dr, c + dc
-        if nr < 0 or nr >= rows or nc < 0 or nc >= cols:
-            return "out_of_bounds"
-        if grid[nr][nc] == "#":
-            return "blocked"
-        return "clear"
+    :return: A tuple (candidates, looping) where candidates is a list of
+             (obstruction, resume_cell, resume_direction) tuples and looping
+             tells whether the original route never leaves the map.
+    """
+    cols = index["cols"]
+    cell, d = index["start"], index["direction"]
+    seen = bytearray(index["rows"] * cols)
+    seen[cell] = 1
+    turn_states = bytearray(index["rows"] * cols)
+    candidates = []
 
     while True:
-        dr, dc = directions[dir_index]
-        forward_status = is_forward_status(current_row, current_col, dr, dc)
-
-        if forward_status == "out_of_bounds":
-            # Guard leaves grid
-            return {"stuck": False, "visited_count": len(visited_positions)}
-
-        steps_turned = 0
-        # Turn right while blocked
-        while forward_status == "blocked":
-            dir_index = (dir_index + 1) % 4
-            dr, dc = directions[dir_index]
-            forward_status = is_forward_status(current_row, current_col, dr, dc)
-            steps_turned += 1
-            if steps_turned == 4:
-                # Stuck in place (no direction to go)
-                return {"stuck": True, "visited_count": len(visited_positions)}
-
-        if forward_status == "out_of_bounds":
-            # Guard leaves grid
-            return {"stuck": False, "visited_count": len(visited_positions)}
-
-        # Move forward
-        current_row += dr
-        current_col += dc
-        visited_positions.add((current_row, current_col))
-
-        # Check for looping state
-        current_state = (current_row, current_col, dir_index)
-        if current_state in visited_states:
-            # We've been here facing the same direction before -> loop
-            return {"stuck": True, "visited_count": len(visited_positions)}
-        visited_states.add(current_state)
+        stop = next_stop(index, cell, d)
+        dr, dc = directions[d]
+        delta = dr * cols + dc
+        end = stop if stop >= 0 else edge_cell(index, cell, d)
+        for position in range(cell + delta, end + delta, delta):
+            if not seen[position]:
+                seen[position] = 1
+                candidates.append((position, position - delta, d))
+        if stop < 0 or turn_states[stop] & (1 << d):
+            return candidates, stop >= 0
+        turn_states[stop] |= 1 << d
+        cell, d = stop, (d + 1) % 4
 
 
-def count_positions_visited(grid):
-    """Part One: How many distinct positions will the guard visit before leaving?"""
-    sim_result = simulate_guard(copy.deepcopy(grid))
-    return sim_result["visited_count"]
+# Patrol index shared read-only by the worker processes
+worker_index = None
 
 
-def find_valid_obstruction_positions(grid):
-    """
-    Find all possible positions to place a new obstruction:
-    - It cannot be placed on the guard's starting position.
-    - It must be placed on a '.' cell.
-    """
-    rows = len(grid)
-    cols = len(grid[0])
-    start_row, start_col, _ = find_start_and_direction(grid)
-    valid_positions = []
-    for r in range(rows):
-        for c in range(cols):
-            # Must be a free cell and not the start
-            if (r, c) != (start_row, start_col) and grid[r][c] == ".":
-                valid_positions.append((r, c))
-    return valid_positions
+def init_worker(index):
+    global worker_index
+    worker_index = index
 
 
-def does_obstruction_cause_loop(grid, r, c):
+def does_obstruction_cause_loop(candidate):
     """
-    Place a single obstruction at (r, c) and check if guard gets stuck in a loop.
+    Resume the patrol just before the candidate obstruction and check if guard gets stuck in a loop.
     Return True if placing obstruction causes a loop, False otherwise.
     """
-    test_grid = copy.deepcopy(grid)
-    test_grid[r][c] = "#"
-    sim_result = simulate_guard(test_grid)
-    return sim_result["stuck"]
+    obstruction, resume_cell, resume_direction = candidate
+    return simulate_patrol(worker_index, obstruction=obstruction, start=(resume_cell, resume_direction))
 
 
-def count_loop_positions(original_grid):
+def count_loop_positions(original_grid, workers=None):
     """
     Part Two:
     Count how many distinct positions you could place a single new obstruction
     such that the guard will get stuck in a loop.
     """
-    valid_positions = find_valid_obstruction_positions(original_grid)
-    loop_count = 0
+    index = build_patrol_index(original_grid)
+    if index["start"] is None:
+        return 0
+    candidates, looping = find_route_candidates(index)
 
-    # Parallelize to speed up if large grids
-    with concurrent.futures.ThreadPoolExecutor() as executor:
-        futures = [
-            executor.submit(does_obstruction_cause_loop, original_grid, r, c)
-            for r, c in valid_positions
-        ]
-        for future in concurrent.futures.as_completed(futures):
-            if future.result():
-                loop_count += 1
+    # If the guard already loops, every free cell off the route keeps it looping
+    off_route_count = 0
+    if looping:
+        off_route_count = original_grid["cells"].count(FREE) - len(candidates)
 
-    return loop_count
+    # Each worker receives the index once and simulates candidates without copying it
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(candidates) // (4 * workers))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(index,)) as executor:
+        return off_route_count + sum(executor.map(does_obstruction_cause_loop, candidates, chunksize=chunksize))
 
 
 def main():
@@ -166,7 +264,6 @@ def main():
 
     # Part 2
     print("\nStarting Part 2...")
-    original_grid = load_grid(input_path)
     loop_positions_count = count_loop_positions(original_grid)
     print("Total loop-causing obstruction positions (Part Two):", loop_positions_count)
 
@@ -1,68 +1,146 @@
-from typing import List, Optional, Tuple
+import concurrent.futures
+import itertools
+import os
+from collections import deque
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
 
 
-def parse_equation(line: str) -> Optional[Tuple[int, List[str]]]:
+class CalibrationFailure(NamedTuple):
+    line_number: int
+    line: str
+    error: str
+
+
+def parse_equation(line: str) -> Optional[Tuple[int, List[int]]]:
+    """Parse a 'test_value: numbers' line. Returns None for blank lines and raises ValueError for malformed ones."""
     line = line.strip()
     if not line:
         return None
-    try:
-        test_value_str, numbers_str = line.split(":")
-        test_value = int(test_value_str.strip())
-        numbers = [int(n) for n in numbers_str.strip().split()]
-        if any(n <= 0 for n in numbers):
-            raise ValueError("All numbers must be positive integers")
-        return test_value, numbers
-    except ValueError as e:
-        print(f"Error parsing line '{line}': {e}")
-        return None
-
-
-def is_equation_valid_dp(test_value: int, numbers: List[str]) -> bool:
-    if not numbers:
-        return False
+    test_value_str, numbers_str = line.split(":")
+    test_value = int(test_value_str.strip())
+    numbers = [int(n) for n in numbers_str.strip().split()]
+    if any(n <= 0 for n in numbers):
+        raise ValueError("All numbers must be positive integers")
+    return test_value, numbers
 
-    dp = [set() for _ in range(len(numbers))]
-    dp[0].add(numbers[0])
 
-    for i in range(1, len(numbers)):
-        for prev_result in dp[i - 1]:
-            # Addition
-            dp[i].add(str(int(prev_result) + int(numbers[i])))
-            # Multiplication
-            dp[i].add(str(int(prev_result) * int(numbers[i])))
-            # # Concatenation
-            # dp[i].add(str(prev_result) + str(numbers[i]))
+OPERATORS = ("+", "*", "||")
 
-    return str(test_value) in dp[-1]
 
+def is_equation_valid(test_value: int, numbers: List[int], operators: Sequence[str] = ("+", "*")) -> bool:
+    """
+    Check whether the numbers can be combined left to right into test_value.
 
-def calculate_total_calibration(equations: List[str]) -> Tuple[int, List[int]]:
+    The search runs backwards from test_value, undoing the last operand at each
+    step: + needs a non-negative remainder, * needs divisibility, and || needs
+    the operand to be a decimal suffix of the target. Branches are pruned as
+    soon as an operator cannot apply.
+    """
+    if not numbers:
+        return False
+    unknown = set(operators) - set(OPERATORS)
+    if unknown:
+        raise ValueError(f"Unsupported operators: {sorted(unknown)}")
+    add, multiply, concatenate = ("+" in operators), ("*" in operators), ("||" in operators)
+
+    stack = [(test_value, len(numbers) - 1)]
+    while stack:
+        target, i = stack.pop()
+        number = numbers[i]
+        if i == 0:
+            if target == number:
+                return True
+            continue
+        if add and target >= number:
+            stack.append((target - number, i - 1))
+        if multiply and number and target % number == 0:
+            stack.append((target // number, i - 1))
+        if concatenate and target > number:
+            power = 10 ** len(str(number))
+            if target % power == number:
+                stack.append((target // power, i - 1))
+    return False
+
+
+def evaluate_equations(
+    equations: Iterable[str], operators: Sequence[str] = ("+", "*"), first_line_number: int = 1
+) -> Tuple[int, List[int], List[CalibrationFailure]]:
+    """Validate equations, returning the total, the valid test values and the lines that failed to parse."""
     total = 0
     valid_equations = []
-    for line in equations:
-        parsed = parse_equation(line)
+    failures = []
+    for line_number, line in enumerate(equations, first_line_number):
+        try:
+            parsed = parse_equation(line)
+        except ValueError as e:
+            failures.append(CalibrationFailure(line_number, line.strip(), str(e)))
+            continue
         if parsed is None:
             continue
         test_value, numbers = parsed
-        if is_equation_valid_dp(test_value, numbers):
+        if is_equation_valid(test_value, numbers, operators):
             total += test_value
             valid_equations.append(test_value)
+    return total, valid_equations, failures
+
+
+def calculate_total_calibration(equations: List[str], operators: Sequence[str] = ("+", "*")) -> Tuple[int, List[int]]:
+    total, valid_equations, _ = evaluate_equations(equations, operators)
     return total, valid_equations
 
 
+def evaluate_chunk(lines: List[str], operators: Sequence[str], first_line_number: int) -> Tuple[int, List[CalibrationFailure]]:
+    total, _, failures = evaluate_equations(lines, operators, first_line_number)
+    return total, failures
+
+
+def calculate_total_calibration_batch(
+    input_path: str, operators: Sequence[str] = ("+", "*"), chunk_lines: int = 50_000, workers: Optional[int] = None
+) -> Tuple[int, List[CalibrationFailure]]:
+    """
+    Stream a calibration file and validate it in chunks on a process pool.
+
+    At most two chunks per worker are in flight, so memory stays bounded
+    whatever the file size.
+
+    :return: The total calibration result and the lines that failed to parse, in file order.
+    """
+    workers = workers or os.cpu_count() or 1
+    total = 0
+    failures = []
+    with open(input_path, "r") as file, concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        max_pending = 2 * workers
+        pending = deque()
+        line_number = 1
+        while chunk := list(itertools.islice(file, chunk_lines)):
+            pending.append(executor.submit(evaluate_chunk, chunk, operators, line_number))
+            line_number += len(chunk)
+            while len(pending) >= max_pending:
+                chunk_total, chunk_failures = pending.popleft().result()
+                total += chunk_total
+                failures.extend(chunk_failures)
+        for future in pending:
+            chunk_total, chunk_failures = future.result()
+            total += chunk_total
+            failures.extend(chunk_failures)
+    return total, failures
+
+
 def main():
     input_path = "inputs/input_day7.txt"
 
     try:
-        with open(input_path, "r") as file:
-            equations = file.readlines()
+        total, failures = calculate_total_calibration_batch(input_path)
     except FileNotFoundError:
         print(f"Input file '{input_path}' not found.")
         return
+    print("Total Calibration Result:", total)
 
-    total, _ = calculate_total_calibration(equations)
+    total, _ = calculate_total_calibration_batch(input_path, OPERATORS)
+    print("Total Calibration Result with Concatenation:", total)
 
-    print("Total Calibration Result:", total)
+    for failure in failures:
+        print(f"Error parsing line {failure.line_number} '{failure.line}': {failure.error}")
 
 
 if __name__ == "__main__":
@@ -1,3 +1,4 @@
+import math
 from collections import defaultdict
 
 
@@ -44,47 +45,122 @@ def calculate_antinodes(grid, antennas):
     return len(antinodes)
 
 
+def line_k_range(position, step, size):
+    """Return the (lo, hi) range of k keeping position + k * step inside [0, size)."""
+    if step > 0:
+        return -(position // step), (size - 1 - position) // step
+    if step < 0:
+        return -((size - 1 - position) // -step), position // -step
+    return -math.inf, math.inf
+
+
+def line_cells(x, y, dx, dy, width, height):
+    """
+    Return the flat indices of every grid position in line with (x, y) along (dx, dy).
+
+    The step is reduced by the gcd so no in-line position is skipped, and the
+    in-bounds k-range is computed in closed form. In the flat grid the
+    positions form an arithmetic progression, returned as an ascending range.
+    """
+    g = math.gcd(dx, dy)
+    sx, sy = dx // g, dy // g
+    lo_x, hi_x = line_k_range(x, sx, width)
+    lo_y, hi_y = line_k_range(y, sy, height)
+    lo, hi = max(lo_x, lo_y), min(hi_x, hi_y)
+
+    step = sy * width + sx
+    first, last = y * width + x + lo * step, y * width + x + hi * step
+    if step < 0:
+        first, last, step = last, first, -step
+    return range(first, last + 1, step)
+
+
+def mark_line(marked, x, y, dx, dy, width, height):
+    """Mark a whole line of positions with a single extended slice assignment."""
+    cells = line_cells(x, y, dx, dy, width, height)
+    marked[cells.start : cells.stop : cells.step] = b"\x01" * len(cells)
+
+
 def calculate_antinodes2(grid, antennas):
     """
     Calculate antinodes for Part 2 rules:
     - Antinodes occur at any position in line with at least two antennas of the same frequency.
     - Positions occupied by antennas themselves are also antinodes if in line with others.
     """
-    antinodes = set()
     height, width = len(grid), len(grid[0])
+    marked = bytearray(width * height)
 
     for _, positions in antennas.items():
         for i, (x1, y1) in enumerate(positions):
-            for j, (x2, y2) in enumerate(positions):
-                if i >= j:  # Avoid duplicate calculations
-                    continue
+            for x2, y2 in positions[i + 1 :]:
+                mark_line(marked, x1, y1, x2 - x1, y2 - y1, width, height)
 
-                dx, dy = x2 - x1, y2 - y1
+    return marked.count(1)
 
-                # Include the two antennas as antinodes
-                antinodes.add((x1, y1))
-                antinodes.add((x2, y2))
-
-                # Extend line in both directions to find antinodes
-                k = 1
-                while True:
-                    ax, ay = x1 - k * dx, y1 - k * dy  # Backward direction
-                    if 0 <= ax < width and 0 <= ay < height:
-                        antinodes.add((ax, ay))
-                    else:
-                        break
-                    k += 1
-
-                k = 1
-                while True:
-                    ax, ay = x2 + k * dx, y2 + k * dy  # Forward direction
-                    if 0 <= ax < width and 0 <= ay < height:
-                        antinodes.add((ax, ay))
-                    else:
-                        break
-                    k += 1
 
-    return len(antinodes)
+class AntinodeIndex:
+    """
+    Antinode counts that follow single antenna additions and removals.
+
+    Every cell keeps a reference count of the antenna pairs that make it an
+    antinode, under the Part 1 and Part 2 rules. Changing an antenna only
+    touches its pairs with the other antennas of the same frequency, and both
+    counts are kept up to date so they are read in O(1).
+    """
+
+    def __init__(self, width, height, antennas=None):
+        self.width = width
+        self.height = height
+        self.antennas = defaultdict(list)
+        self.occupied = {}
+        self.part1_refs = [0] * (width * height)
+        self.part2_refs = [0] * (width * height)
+        self.part1_count = 0
+        self.part2_count = 0
+        for frequency, positions in (antennas or {}).items():
+            for x, y in positions:
+                self.add_antenna(frequency, x, y)
+
+    @classmethod
+    def from_grid(cls, grid):
+        return cls(len(grid[0]), len(grid), find_antennas(grid))
+
+    def add_antenna(self, frequency, x, y):
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise ValueError(f"Antenna ({x}, {y}) is outside the grid")
+        if (x, y) in self.occupied:
+            raise ValueError(f"Position ({x}, {y}) already holds antenna '{self.occupied[(x, y)]}'")
+        for other in self.antennas[frequency]:
+            self.update_pair(other, (x, y), 1)
+        self.antennas[frequency].append((x, y))
+        self.occupied[(x, y)] = frequency
+
+    def remove_antenna(self, frequency, x, y):
+        if self.occupied.get((x, y)) != frequency:
+            raise ValueError(f"No antenna '{frequency}' at ({x}, {y})")
+        self.antennas[frequency].remove((x, y))
+        del self.occupied[(x, y)]
+        for other in self.antennas[frequency]:
+            self.update_pair(other, (x, y), -1)
+
+    def update_pair(self, first, second, delta):
+        """Add (delta=1) or remove (delta=-1) the antinodes of one antenna pair."""
+        (x1, y1), (x2, y2) = first, second
+        dx, dy = x2 - x1, y2 - y1
+
+        for ax, ay in ((x1 - dx, y1 - dy), (x2 + dx, y2 + dy)):
+            if 0 <= ax < self.width and 0 <= ay < self.height:
+                self.part1_count += self.update_cell(self.part1_refs, ay * self.width + ax, delta)
+
+        for cell in line_cells(x1, y1, dx, dy, self.width, self.height):
+            self.part2_count += self.update_cell(self.part2_refs, cell, delta)
+
+    @staticmethod
+    def update_cell(refs, cell, delta):
+        """Update a reference count and return the change in the number of antinode cells."""
+        before = refs[cell]
+        refs[cell] = before + delta
+        return (refs[cell] > 0) - (before > 0)
 
 
 def main():
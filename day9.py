@@ -1,3 +1,6 @@
+import heapq
+
+
 def load_disk_map(file_path):
     """Load the disk map from the specified file."""
     with open(file_path, "r") as file:
@@ -12,76 +15,115 @@ def parse_disk_map(disk_map):
     ]
 
 
-def generate_initial_blocks(segments):
-    """Generate initial block representation of files and free spaces."""
-    file_blocks = []
+def generate_initial_extents(segments):
+    """
+    Generate the initial extent representation of files and free spaces.
+
+    Each extent is a (start, length, file_id) tuple, with file_id None for
+    free space. Files of length zero take no id, and free spaces they would
+    have separated are merged.
+    """
+    extents = []
     file_id = 0
+    position = 0
     for file_length, free_length in segments:
-        file_blocks.extend([file_id] * file_length)
-        file_blocks.extend(["."] * free_length)
         if file_length > 0:
+            extents.append((position, file_length, file_id))
+            position += file_length
             file_id += 1
-    return file_blocks
+        if free_length > 0:
+            if extents and extents[-1][2] is None:
+                start, length, _ = extents.pop()
+                extents.append((start, length + free_length, None))
+            else:
+                extents.append((position, free_length, None))
+            position += free_length
+    return extents
+
+
+def compact_extents_single_move(extents):
+    """
+    Compact files one block at a time to the leftmost free space.
+
+    A left pointer walks the extents in order and fills each free extent with
+    blocks taken from the file under the right pointer, so every move is a
+    whole run of blocks and no block list is ever built.
+    """
+    files = [extent for extent in extents if extent[2] is not None]
+    remaining = [length for _, length, _ in files]
+
+    compacted = []
+    position = 0
+    next_file = 0  # Index of the first file after the current extent
+    right = len(files) - 1
+    for _, length, file_id in extents:
+        if file_id is None:
+            free = length
+            while free and right >= next_file:
+                moved = min(free, remaining[right])
+                compacted.append((position, moved, files[right][2]))
+                position += moved
+                free -= moved
+                remaining[right] -= moved
+                if remaining[right] == 0:
+                    right -= 1
+            continue
 
+        if next_file > right:
+            break
+        compacted.append((position, remaining[next_file], file_id))
+        position += remaining[next_file]
+        next_file += 1
 
-def compact_blocks_single_move(file_blocks):
-    """Compact file blocks one at a time to the leftmost free space."""
-    for i in range(len(file_blocks) - 1, -1, -1):
-        if file_blocks[i] != "." and "." in file_blocks[:i]:
-            free_index = file_blocks.index(".")
-            file_blocks[free_index] = file_blocks[i]
-            file_blocks[i] = "."
-    return file_blocks
+    return compacted
 
 
-def compact_blocks_whole_file(file_blocks):
-    """Compact file blocks by moving whole files to the leftmost span of free space."""
-    unique_file_ids = sorted(set(filter(lambda x: x != ".", file_blocks)), reverse=True)
+def compact_extents_whole_file(extents):
+    """
+    Compact files by moving whole files to the leftmost span of free space.
 
-    for file_id in unique_file_ids:
-        # Identify the positions of the current file
-        file_positions = [i for i, block in enumerate(file_blocks) if block == file_id]
+    Free spans are kept in one min-heap of start positions per span length.
+    Each file takes the leftmost span that fits: the candidate heap tops are
+    compared, the chosen span is popped and its leftover is pushed to the
+    heap for its new length.
+    """
+    spans = [(start, length) for start, length, file_id in extents if file_id is None]
+    heaps = [[] for _ in range(max((length for _, length in spans), default=0) + 1)]
+    for start, length in spans:
+        heaps[length].append(start)  # Spans are in ascending start order, so each list is already a heap
 
-        # Skip if no positions found or no free space to the left of the file
-        if not file_positions or all(
-            file_blocks[i] != "." for i in range(file_positions[0])
-        ):
-            continue
+    compacted = []
+    for file_start, file_length, file_id in reversed([extent for extent in extents if extent[2] is not None]):
+        best_start, best_length = file_start, None
+        for length in range(file_length, len(heaps)):
+            if heaps[length] and heaps[length][0] < best_start:
+                best_start, best_length = heaps[length][0], length
+
+        if best_length is not None:
+            heapq.heappop(heaps[best_length])
+            if best_length > file_length:
+                heapq.heappush(heaps[best_length - file_length], best_start + file_length)
+        compacted.append((best_start, file_length, file_id))
 
-        file_size = len(file_positions)
-        start_limit = file_positions[
-            0
-        ]  # The file can only move to spaces left of this position
+    return compacted
 
-        # Find the leftmost free span that can fit the file and is entirely to the left
-        for start_index in range(start_limit - file_size + 1):
-            if all(
-                file_blocks[i] == "."
-                for i in range(start_index, start_index + file_size)
-            ):
-                # Move the file to the free span
-                for pos in file_positions:
-                    file_blocks[pos] = "."
-                for i in range(start_index, start_index + file_size):
-                    file_blocks[i] = file_id
-                break
 
-    return file_blocks
+def series_checksum(file_id, start, length):
+    """Checksum of a file occupying blocks start .. start + length - 1."""
+    return file_id * (2 * start + length - 1) * length // 2
 
 
-def calculate_checksum(file_blocks):
-    """Calculate the checksum of the file system."""
-    return sum(
-        position * block for position, block in enumerate(file_blocks) if block != "."
-    )
+def calculate_checksum(extents):
+    """Calculate the checksum of the file system, one arithmetic series per file extent."""
+    return sum(series_checksum(file_id, start, length) for start, length, file_id in extents if file_id is not None)
 
 
 def solve_disk_fragmenter(disk_map, compaction_method):
     """Solve the disk fragmenter problem using the given compaction method."""
     segments = parse_disk_map(disk_map)
-    file_blocks = generate_initial_blocks(segments)
-    compacted_blocks = compaction_method(file_blocks)
-    return calculate_checksum(compacted_blocks)
+    extents = generate_initial_extents(segments)
+    compacted_extents = compaction_method(extents)
+    return calculate_checksum(compacted_extents)
 
 
 def main():
@@ -91,11 +133,11 @@ def main():
     disk_map = load_disk_map(file_path)
 
     # Part One: Single block moves
-    result_part_one = solve_disk_fragmenter(disk_map, compact_blocks_single_move)
+    result_part_one = solve_disk_fragmenter(disk_map, compact_extents_single_move)
     print("Checksum (Part One):", result_part_one)
 
     # Part Two: Whole file moves
-    result_part_two = solve_disk_fragmenter(disk_map, compact_blocks_whole_file)
+    result_part_two = solve_disk_fragmenter(disk_map, compact_extents_whole_file)
     print("Checksum (Part Two):", result_part_two)
 
 